@@ -0,0 +1,220 @@
+"""
+HTTP load test for the IRIS dashboard.
+
+Simulates N dashboards, each polling /api/run, /api/latest (delta view) and
+the checkpoint images once per interval like static/app.js does, while a
+writer thread posts demo events so latest.json / events.jsonl keep changing.
+
+    python3 scripts/serve_ui.py --threads 16 &
+    python3 scripts/load_test_ui.py --dashboards 40 --duration 60 --write-rate 5 \
+        --start-run --seed-images
+
+The demo endpoints never render images, so --seed-images (run on the UI
+host) writes a real JPEG per checkpoint to outputs/current/images/, the
+path demo entries point at. Without it every image request is a 404 and
+the run is reported as failed.
+
+Reports request rate, latency percentiles and error rates per endpoint.
+Errors are transport failures and 5xx; 4xx are counted separately.
+"""
+import argparse
+import gzip
+import json
+import os, sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.client_errors: Dict[str, int] = defaultdict(int)
+        self.bytes: Dict[str, int] = defaultdict(int)
+
+    def record(self, name: str, dt: float, status: Optional[int], nbytes: int) -> None:
+        with self.lock:
+            self.latencies[name].append(dt)
+            self.bytes[name] += nbytes
+            if status is None or status >= 500:
+                self.errors[name] += 1
+            elif status >= 400:
+                self.client_errors[name] += 1
+
+
+def request(base: str, path: str, method: str = "GET", accept_gzip: bool = True) -> Tuple[Optional[int], bytes]:
+    req = urllib.request.Request(base + path, method=method)
+    if accept_gzip:
+        req.add_header("Accept-Encoding", "gzip")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as r:
+            return r.status, r.read()
+    except urllib.error.HTTPError as e:
+        return e.code, b""
+    except Exception:
+        return None, b""
+
+
+def timed(stats: Stats, name: str, base: str, path: str, method: str = "GET") -> Tuple[Optional[int], bytes]:
+    t0 = time.perf_counter()
+    status, body = request(base, path, method)
+    stats.record(name, time.perf_counter() - t0, status, len(body))
+    return status, body
+
+
+def dashboard(base: str, interval: float, stop: threading.Event, stats: Stats) -> None:
+    version = None
+    images: Dict[str, str] = {}
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        timed(stats, "/api/run", base, "/api/run")
+
+        q = "" if version is None else f"&since={version}"
+        status, body = timed(stats, "/api/latest", base, f"/api/latest?view=list{q}")
+        if status == 200:
+            try:
+                # urllib does not decode gzip itself
+                raw = gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body
+                delta = json.loads(raw)
+                version = delta.get("version")
+                for cid, d in delta.get("checkpoints", {}).items():
+                    image = d.get("image", "")
+                    images[cid] = (f"/{image}" if image.startswith("evidence/")
+                                   else f"/images/{cid}.jpg?v={d.get('updated_utc', '')}")
+            except ValueError:
+                pass
+
+        # the dashboard only reloads images whose version changed
+        for cid, url in list(images.items()):
+            if url is not None:
+                timed(stats, "/images/*", base, url)
+                images[cid] = None
+
+        stop.wait(max(0.0, interval - (time.perf_counter() - t0)))
+
+
+def writer(base: str, rate: float, fail_ratio: float, stop: threading.Event, stats: Stats) -> None:
+    if rate <= 0:
+        return
+    period = 1.0 / rate
+    # fractional accumulator: the FAIL share tracks fail_ratio exactly
+    owed = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        owed += fail_ratio
+        if owed >= 1.0:
+            owed -= 1.0
+            kind = "fail"
+        else:
+            kind = "pass"
+        timed(stats, "writer", base, f"/api/demo/simulate_{kind}", method="POST")
+        stop.wait(max(0.0, period - (time.perf_counter() - t0)))
+
+
+def seed_images(base: str, images_dir: Path, size: str) -> int:
+    """Write one JPEG per checkpoint currently in /api/latest."""
+    import cv2
+    import numpy as np
+
+    status, body = request(base, "/api/latest?view=list", accept_gzip=False)
+    if status != 200:
+        raise SystemExit(f"cannot list checkpoints for seeding (HTTP {status})")
+    ids = json.loads(body).get("ids") or []
+    w, h = (int(x) for x in size.lower().split("x"))
+    images_dir.mkdir(parents=True, exist_ok=True)
+    for cid in ids:
+        img = np.random.randint(0, 255, (h, w, 3), dtype=np.uint8)
+        ok, buf = cv2.imencode(".jpg", img)
+        if not ok:
+            raise SystemExit("failed to JPEG-encode seed image")
+        tmp = images_dir / f"{cid}.jpg.tmp"
+        tmp.write_bytes(buf.tobytes())
+        tmp.replace(images_dir / f"{cid}.jpg")
+    return len(ids)
+
+
+def pct(xs: List[float], p: float) -> float:
+    if not xs:
+        return float("nan")
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))]
+
+
+def report(stats: Stats, elapsed: float) -> bool:
+    """Print the table; False if image serving was never actually exercised."""
+    print(f"\n{'endpoint':<14}{'reqs':>8}{'req/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+          f"{'max ms':>9}{'err %':>8}{'4xx':>6}{'KB/req':>8}")
+    for name in sorted(stats.latencies):
+        lat = stats.latencies[name]
+        n = len(lat)
+        print(
+            f"{name:<14}{n:>8}{n / elapsed:>9.1f}"
+            f"{pct(lat, 50) * 1e3:>9.1f}{pct(lat, 90) * 1e3:>9.1f}{pct(lat, 99) * 1e3:>9.1f}"
+            f"{max(lat) * 1e3:>9.1f}{100 * stats.errors[name] / n:>8.2f}"
+            f"{stats.client_errors[name]:>6}{stats.bytes[name] / n / 1024:>8.2f}"
+        )
+
+    img = stats.latencies.get("/images/*", [])
+    if img and stats.client_errors["/images/*"] == len(img):
+        print("\nFAILED: every /images/* request was 4xx, so image latency only "
+              "measures the 404 path. Re-run with --seed-images on the UI host.")
+        return False
+    return True
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Load-test the IRIS dashboard")
+    ap.add_argument("--url", default="http://127.0.0.1:5000")
+    ap.add_argument("--dashboards", type=int, default=20, help="simulated control-room screens")
+    ap.add_argument("--interval", type=float, default=1.0, help="poll interval per dashboard (s)")
+    ap.add_argument("--duration", type=float, default=30.0, help="test length (s)")
+    ap.add_argument("--write-rate", type=float, default=2.0, help="demo events posted per second (0 = none)")
+    ap.add_argument("--fail-ratio", type=float, default=0.2, help="fraction of posted events that FAIL")
+    ap.add_argument("--start-run", action="store_true", help="POST /api/demo/start before the test")
+    ap.add_argument("--seed-images", action="store_true",
+                    help="write a JPEG per checkpoint into --images-dir before the test (UI host only)")
+    ap.add_argument("--images-dir", default=str(ROOT / "outputs" / "current" / "images"))
+    ap.add_argument("--image-size", default="640x480", help="WxH of seeded images")
+    args = ap.parse_args()
+
+    base = args.url.rstrip("/")
+    if args.start_run:
+        request(base, "/api/demo/start", method="POST")
+    if args.seed_images:
+        n = seed_images(base, Path(args.images_dir), args.image_size)
+        print(f"seeded {n} images into {args.images_dir}")
+
+    stats = Stats()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=dashboard, args=(base, args.interval, stop, stats), daemon=True)
+        for _ in range(args.dashboards)
+    ]
+    threads.append(threading.Thread(
+        target=writer, args=(base, args.write_rate, args.fail_ratio, stop, stats), daemon=True
+    ))
+
+    print(f"{args.dashboards} dashboards @ {args.interval}s, {args.write_rate} writes/s, "
+          f"{args.duration}s against {base}")
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=15)
+
+    if not report(stats, time.perf_counter() - t0):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
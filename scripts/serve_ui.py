@@ -0,0 +1,44 @@
+"""
+Production entry point for the IRIS dashboard.
+
+Serves the Flask app with waitress (multi-threaded WSGI server) instead of
+Flask's single-process development server:
+
+    python3 scripts/serve_ui.py --host 0.0.0.0 --port 5000 --threads 16
+
+For multiple worker processes on Linux, gunicorn works with the same app:
+
+    gunicorn -w 4 --threads 8 -b 0.0.0.0:5000 src.ui.app:app
+"""
+import argparse
+import os, sys
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from src.ui.app import app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve the IRIS dashboard with waitress")
+    ap.add_argument("--host", default=os.environ.get("IRIS_UI_HOST", "127.0.0.1"))
+    ap.add_argument("--port", type=int, default=int(os.environ.get("IRIS_UI_PORT", "5000")))
+    ap.add_argument("--threads", type=int, default=int(os.environ.get("IRIS_UI_THREADS", "8")),
+                    help="worker threads handling requests concurrently")
+    ap.add_argument("--connection-limit", type=int, default=int(os.environ.get("IRIS_UI_CONNECTIONS", "200")),
+                    help="max simultaneous open connections (one per polling dashboard is typical)")
+    args = ap.parse_args()
+
+    from waitress import serve
+
+    print(f"IRIS UI on http://{args.host}:{args.port}/ ({args.threads} threads)")
+    serve(
+        app,
+        host=args.host,
+        port=args.port,
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        ident="iris",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Synthetic workload generator for the IRIS persistence layer.
+
+Drives the same writer paths as the ROS node, in-process and without
+ROS/YOLO:
+  - writer.append_event      -> events.jsonl
+  - writer.update_latest     -> latest.json
+  - run.json + report.json/report.csv (as IRISInspector._write_run_and_reports)
+  - rollups.sqlite (trend rollups)
+  - ImageStore.put           -> evidence/objects/... (optional)
+
+    python3 scripts/stress_writers.py --checkpoints 200 --rate 0 --duration 30
+    python3 scripts/stress_writers.py --checkpoints 50 --rate 100 --images --report-every 10
+
+Reports sustained events/sec, per-step latency, write amplification (bytes
+written to disk per byte of event JSON) and process RSS growth (includes
+native memory such as sqlite page cache and OpenCV/numpy buffers).
+Python-heap detail is available with --tracemalloc, at a large cost in
+measured throughput.
+"""
+import argparse
+import json
+import os, sys
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.inspection.schema import make_run_id, utc_now_iso
+from src.inspection.run_io import write_json, build_report_from_events, write_csv
+from src.inspection.writer import append_event, update_latest
+from src.inspection.image_store import ImageStore
+from src.inspection.rollups import RollupStore, event_confidence
+
+
+class Meter:
+    """Wall time and bytes written per step."""
+
+    def __init__(self):
+        self.times: Dict[str, List[float]] = {}
+        self.bytes: Dict[str, int] = {}
+
+    def add(self, step: str, dt: float, nbytes: int) -> None:
+        self.times.setdefault(step, []).append(dt)
+        self.bytes[step] = self.bytes.get(step, 0) + nbytes
+
+
+def _size(*paths: Path) -> int:
+    return sum(p.stat().st_size for p in paths if p.exists())
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc), else peak RSS from getrusage."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def _mb(nbytes: Optional[int]) -> str:
+    return "n/a" if nbytes is None else f"{nbytes / 1e6:.1f} MB"
+
+
+def _sqlite_files(db: Path) -> List[Path]:
+    return [db, db.with_name(db.name + "-wal")]
+
+
+def _wchar() -> Optional[int]:
+    """Bytes this process has passed to write() so far (Linux /proc), else None."""
+    try:
+        with open("/proc/self/io", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+class SqliteWrites:
+    """
+    Bytes a sqlite-backed step wrote. WAL pages are overwritten in place after
+    each checkpoint, so file growth alone undercounts; use the process write
+    counter when available and fall back to growth of the db + -wal files.
+    """
+
+    def __init__(self, *files: Path):
+        self.files = files
+        self.w0 = _wchar()
+        self.size0 = _size(*files)
+
+    def bytes(self) -> int:
+        w = _wchar()
+        if self.w0 is not None and w is not None:
+            return w - self.w0
+        return max(0, _size(*self.files) - self.size0)
+
+
+def make_conditions(cid: str, failed: bool) -> List[Dict]:
+    if cid.endswith("door"):
+        observed = random.choice(["OPEN", "SEMI"]) if failed else "CLOSED"
+        name, expected = "door_state", "CLOSED"
+    else:
+        observed = "PRESENT" if failed else "ABSENT"
+        name, expected = "debris", "ABSENT"
+    conf = round(random.uniform(0.4, 0.99), 3)
+    return [{
+        "name": name,
+        "condition_name": name,
+        "expected": expected,
+        "observed": observed,
+        "pass": not failed,
+        "passed": not failed,
+        "confidence": conf,
+    }]
+
+
+def make_frame(width: int, height: int):
+    import numpy as np
+    return np.random.randint(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def write_run_and_reports(out_dir: Path, run_id: str, start: str, total: int,
+                          latest_path: Path, events_path: Path, meter: Meter) -> None:
+    t0 = time.perf_counter()
+    latest = json.loads(latest_path.read_text(encoding="utf-8") or "{}")
+    passed = sum(1 for v in latest.values() if isinstance(v, dict) and v.get("result") == "PASS")
+    failed = total - passed
+    write_json(out_dir / "run.json", {
+        "run_id": run_id,
+        "start_time_utc": start,
+        "run_state": "IN_PROGRESS",
+        "robot_state": "EVALUATING",
+        "summary": {
+            "total": total,
+            "passed": passed,
+            "failed": failed,
+            "last_updated_utc": utc_now_iso(),
+            "status": "PASS" if failed == 0 else "FAIL",
+        },
+    })
+    meter.add("run.json", time.perf_counter() - t0, _size(out_dir / "run.json"))
+
+    t0 = time.perf_counter()
+    rows = build_report_from_events(events_path)
+    write_json(out_dir / "report.json", rows)
+    write_csv(out_dir / "report.csv", rows)
+    meter.add("report", time.perf_counter() - t0, _size(out_dir / "report.json", out_dir / "report.csv"))
+
+
+def pct(xs: List[float], p: float) -> float:
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))] if xs else float("nan")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stress-test IRIS writers with synthetic events")
+    ap.add_argument("--checkpoints", type=int, default=50)
+    ap.add_argument("--rate", type=float, default=0, help="target events/sec (0 = as fast as possible)")
+    ap.add_argument("--duration", type=float, default=20.0, help="run length (s)")
+    ap.add_argument("--max-events", type=int, default=0, help="stop after this many events (0 = no limit)")
+    ap.add_argument("--fail-ratio", type=float, default=0.1)
+    ap.add_argument("--images", action="store_true", help="also store an evidence JPEG per event")
+    ap.add_argument("--distinct-frames", type=int, default=16,
+                    help="number of distinct synthetic frames (repeats are deduplicated by the store)")
+    ap.add_argument("--image-size", default="640x480", help="WxH of generated frames")
+    ap.add_argument("--report-every", type=int, default=1,
+                    help="regenerate run.json/report.* every N events (the node does it every event)")
+    ap.add_argument("--out", default="", help="output dir (default: a temp dir, removed afterwards)")
+    ap.add_argument("--progress", type=float, default=5.0, help="progress line every N seconds")
+    ap.add_argument("--tracemalloc", action="store_true",
+                    help="also report Python-heap growth (slows the run considerably)")
+    args = ap.parse_args()
+
+    tmp = None
+    if args.out:
+        out_dir = Path(args.out)
+    else:
+        tmp = tempfile.mkdtemp(prefix="iris_stress_")
+        out_dir = Path(tmp)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_dir / "images").mkdir(exist_ok=True)
+    events_path = out_dir / "events.jsonl"
+    latest_path = out_dir / "latest.json"
+    events_path.write_text("", encoding="utf-8")
+    latest_path.write_text("{}", encoding="utf-8")
+    rollups = RollupStore(out_dir / "rollups.sqlite")
+
+    ids = [f"cp_{i:04d}_{'door' if i % 2 else 'aisle'}" for i in range(args.checkpoints)]
+    run_id, start = make_run_id(), utc_now_iso()
+    w, h = (int(x) for x in args.image_size.lower().split("x"))
+    frames = [make_frame(w, h) for _ in range(args.distinct_frames)] if args.images else []
+    evidence = ImageStore(out_dir / "evidence") if args.images else None
+
+    meter = Meter()
+    logical_bytes = 0
+    n = 0
+
+    if args.tracemalloc:
+        tracemalloc.start()
+        heap0 = tracemalloc.get_traced_memory()[0]
+    rss0 = _rss_bytes()
+    rss_peak = rss0
+    t_start = time.perf_counter()
+    t_next_progress = t_start + args.progress
+    n_at_progress = 0
+
+    print(f"{args.checkpoints} checkpoints, target {args.rate or 'max'} ev/s, "
+          f"{args.duration}s, images={'on' if args.images else 'off'}, out={out_dir}")
+    try:
+        while True:
+            now = time.perf_counter()
+            if now - t_start >= args.duration or (args.max_events and n >= args.max_events):
+                break
+            if args.rate > 0:
+                due = t_start + n / args.rate
+                if due > now:
+                    time.sleep(due - now)
+
+            cid = ids[n % len(ids)]
+            failed = random.random() < args.fail_ratio
+            result = "FAIL" if failed else "PASS"
+            conds = make_conditions(cid, failed)
+            timestamp = utc_now_iso()
+            img_path = out_dir / "images" / f"{cid}.jpg"
+
+            if evidence is not None:
+                t0 = time.perf_counter()
+                blobs0 = evidence.total_bytes()
+                writes = SqliteWrites(*_sqlite_files(evidence.root / "index.sqlite"))
+                sha = evidence.put(frames[n % len(frames)], cid, timestamp, result=result, run_id=run_id)
+                img_path = evidence.path_for(sha)
+                nbytes = writes.bytes()
+                if writes.w0 is None:
+                    # no process write counter: add new JPEG blobs to the index growth
+                    nbytes += max(0, evidence.total_bytes() - blobs0)
+                meter.add("evidence", time.perf_counter() - t0, nbytes)
+
+            event = {
+                "timestamp_utc": timestamp,
+                "run_id": run_id,
+                "run_start_utc": start,
+                "checkpoint_id": cid,
+                "checkpoint_name": cid,
+                "checkpoint_sequence": n % len(ids) + 1,
+                "camera_id": cid,
+                "result": result,
+                "conditions": conds,
+                "image_ref": str(img_path),
+            }
+            line_bytes = len(json.dumps(event)) + 1
+            logical_bytes += line_bytes
+
+            t0 = time.perf_counter()
+            append_event(events_path, event)
+            meter.add("append_event", time.perf_counter() - t0, line_bytes)
+
+            t0 = time.perf_counter()
+            update_latest(latest_path, cid, {
+                "updated_utc": event["timestamp_utc"],
+                "run_id": run_id,
+                "run_start_utc": start,
+                "checkpoint_sequence": event["checkpoint_sequence"],
+                "checkpoint_name": cid,
+                "result": result,
+                "reason": "" if not failed else f"{conds[0]['name']}: synthetic failure",
+                "image": f"evidence/{evidence.ref_for(sha)}" if evidence is not None else f"images/{cid}.jpg",
+                "conditions": conds,
+            })
+            meter.add("update_latest", time.perf_counter() - t0, _size(latest_path))
+
+            t0 = time.perf_counter()
+            writes = SqliteWrites(*_sqlite_files(rollups.path))
+            rollups.add(cid, event["timestamp_utc"], result, event_confidence(conds))
+            rollups.prune()
+            meter.add("rollups", time.perf_counter() - t0, writes.bytes())
+
+            n += 1
+            if n % args.report_every == 0:
+                write_run_and_reports(out_dir, run_id, start, len(ids), latest_path, events_path, meter)
+
+            if args.progress and time.perf_counter() >= t_next_progress:
+                el = time.perf_counter() - t_start
+                rss = _rss_bytes()
+                if rss is not None and rss_peak is not None:
+                    rss_peak = max(rss_peak, rss)
+                print(f"  t={el:6.1f}s events={n:7d} "
+                      f"rate={(n - n_at_progress) / args.progress:8.1f} ev/s "
+                      f"events.jsonl={_size(events_path) / 1e6:7.2f} MB "
+                      f"rss={_mb(rss)}")
+                n_at_progress = n
+                t_next_progress += args.progress
+    finally:
+        rollups.close()
+        if evidence is not None:
+            evidence.close()
+        elapsed = time.perf_counter() - t_start
+        rss1 = _rss_bytes()
+        if rss1 is not None and rss_peak is not None:
+            rss_peak = max(rss_peak, rss1)
+        if args.tracemalloc:
+            heap1, heap_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        physical = sum(meter.bytes.values())
+        print(f"\nevents:            {n}")
+        print(f"elapsed:           {elapsed:.2f} s")
+        print(f"sustained rate:    {n / elapsed if elapsed else 0:.1f} events/s")
+        print(f"event JSON bytes:  {logical_bytes / 1e6:.2f} MB")
+        print(f"bytes written:     {physical / 1e6:.2f} MB")
+        print(f"write amplif.:     {physical / logical_bytes if logical_bytes else 0:.1f}x")
+        if rss0 is not None and rss1 is not None:
+            print(f"RSS growth:        {(rss1 - rss0) / 1e6:.2f} MB "
+                  f"(start {_mb(rss0)}, end {_mb(rss1)}, peak sampled {_mb(rss_peak)})")
+        else:
+            print("RSS growth:        n/a")
+        if args.tracemalloc:
+            print(f"Python heap:       +{(heap1 - heap0) / 1e6:.2f} MB (peak +{(heap_peak - heap0) / 1e6:.2f} MB)")
+
+        print(f"\n{'step':<15}{'calls':>8}{'mean ms':>10}{'p99 ms':>10}{'max ms':>10}{'MB written':>12}")
+        for step, ts in meter.times.items():
+            print(f"{step:<15}{len(ts):>8}{sum(ts) / len(ts) * 1e3:>10.2f}"
+                  f"{pct(ts, 99) * 1e3:>10.2f}{max(ts) * 1e3:>10.2f}{meter.bytes[step] / 1e6:>12.2f}")
+
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
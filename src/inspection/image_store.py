@@ -0,0 +1,190 @@
+from __future__ import annotations
+import hashlib, sqlite3, threading, time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.inspection.schema import parse_ts
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256    TEXT PRIMARY KEY,
+    size      INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    pinned    INTEGER NOT NULL DEFAULT 0  -- referenced by a FAIL event; never evicted
+);
+CREATE TABLE IF NOT EXISTS refs (
+    run_id        TEXT,
+    checkpoint_id TEXT NOT NULL,
+    timestamp_utc TEXT NOT NULL,
+    t             REAL NOT NULL,
+    result        TEXT,
+    sha256        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refs_run_cp ON refs (run_id, checkpoint_id, t);
+CREATE INDEX IF NOT EXISTS refs_cp_t ON refs (checkpoint_id, t);
+CREATE INDEX IF NOT EXISTS refs_sha ON refs (sha256);
+CREATE INDEX IF NOT EXISTS refs_t ON refs (t);
+"""
+
+# created after the pinned-column migration so older index files upgrade cleanly
+_BLOB_INDEX = "CREATE INDEX IF NOT EXISTS blobs_evict ON blobs (pinned, last_seen);"
+
+
+class ImageStore:
+    """
+    Content-addressed evidence images.
+
+    Layout under root:
+      objects/<sha[:2]>/<sha>.jpg   JPEG bytes, keyed by their SHA-256
+      index.sqlite                  blobs + one ref row per event
+
+    Identical frames are stored once. evict() drops non-FAIL refs older than
+    max_age_s, then the least recently seen blobs until the store fits in
+    max_bytes; any blob referenced by a FAIL event is always kept.
+    """
+
+    def __init__(self, root: Path, max_bytes: Optional[int] = None,
+                 max_age_s: Optional[float] = None, evict_every: int = 100,
+                 jpeg_quality: int = 90):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.evict_every = int(evict_every)
+        self.jpeg_quality = int(jpeg_quality)
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate()
+        self._db.execute(_BLOB_INDEX)
+
+    def _migrate(self) -> None:
+        cols = {r[1] for r in self._db.execute("PRAGMA table_info(blobs)")}
+        if "pinned" in cols:
+            return
+        with self._db:
+            self._db.execute("ALTER TABLE blobs ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+            self._db.execute(
+                "UPDATE blobs SET pinned = 1 WHERE sha256 IN "
+                "(SELECT sha256 FROM refs WHERE result = 'FAIL')"
+            )
+
+    @staticmethod
+    def ref_for(sha: str) -> str:
+        """Path of a blob relative to objects/."""
+        return f"{sha[:2]}/{sha}.jpg"
+
+    def path_for(self, sha: str) -> Path:
+        return self.objects / self.ref_for(sha)
+
+    def put(self, bgr_img, checkpoint_id: str, timestamp_utc: str,
+            result: Optional[str] = None, run_id: Optional[str] = None) -> str:
+        """Store a frame for one event and return its SHA-256."""
+        import cv2  # only writers need OpenCV; the UI just reads the index
+
+        ok, buf = cv2.imencode(".jpg", bgr_img, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("failed to JPEG-encode evidence image")
+        data = buf.tobytes()
+        sha = hashlib.sha256(data).hexdigest()
+
+        path = self.path_for(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+
+        now = time.time()
+        pinned = 1 if result == "FAIL" else 0
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO blobs (sha256, size, last_seen, pinned) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(sha256) DO UPDATE SET last_seen = excluded.last_seen, "
+                "pinned = MAX(pinned, excluded.pinned)",
+                (sha, len(data), now, pinned),
+            )
+            self._db.execute(
+                "INSERT INTO refs (run_id, checkpoint_id, timestamp_utc, t, result, sha256) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, checkpoint_id, timestamp_utc, parse_ts(timestamp_utc), result, sha),
+            )
+
+        self._puts += 1
+        if self.evict_every and self._puts % self.evict_every == 0:
+            self.evict()
+        return sha
+
+    def lookup(self, run_id: Optional[str] = None, checkpoint_id: Optional[str] = None,
+               result: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Newest-first evidence refs matching the given filters."""
+        where, args = [], []
+        for col, val in (("run_id", run_id), ("checkpoint_id", checkpoint_id), ("result", result)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT run_id, checkpoint_id, timestamp_utc, result, sha256 FROM refs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t DESC LIMIT ?"
+        # sqlite treats a negative LIMIT as "no limit"
+        args.append(max(1, int(limit)))
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [
+            {
+                "run_id": r[0],
+                "checkpoint_id": r[1],
+                "timestamp_utc": r[2],
+                "result": r[3],
+                "sha256": r[4],
+                "image": self.ref_for(r[4]),
+            }
+            for r in rows
+        ]
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Apply the age and size limits; returns the number of blobs deleted."""
+        now = time.time() if now is None else now
+        doomed: List[str] = []
+        with self._lock, self._db:
+            db = self._db
+            if self.max_age_s is not None:
+                db.execute(
+                    "DELETE FROM refs WHERE result IS NOT 'FAIL' AND t < ?",
+                    (now - self.max_age_s,),
+                )
+            # blobs nobody points at any more
+            doomed += [r[0] for r in db.execute(
+                "SELECT sha256 FROM blobs WHERE sha256 NOT IN (SELECT sha256 FROM refs)"
+            )]
+            for sha in doomed:
+                db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+
+            if self.max_bytes is not None:
+                total = db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+                if total > self.max_bytes:
+                    candidates = db.execute(
+                        "SELECT sha256, size FROM blobs WHERE pinned = 0 ORDER BY last_seen"
+                    ).fetchall()
+                    for sha, size in candidates:
+                        if total <= self.max_bytes:
+                            break
+                        db.execute("DELETE FROM refs WHERE sha256 = ?", (sha,))
+                        db.execute("DELETE FROM blobs WHERE sha256 = ?", (sha,))
+                        doomed.append(sha)
+                        total -= size
+
+        for sha in doomed:
+            self.path_for(sha).unlink(missing_ok=True)
+        return len(doomed)
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+import sqlite3, threading, time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.inspection.schema import parse_ts
+
+# resolution -> (bucket seconds, retention seconds)
+# Every event is counted at every resolution; old buckets are simply pruned,
+# so history is kept at progressively coarser granularity.
+RESOLUTIONS: Dict[str, tuple] = {
+    "minute": (60, 24 * 3600),
+    "hour": (3600, 30 * 86400),
+    "day": (86400, 400 * 86400),
+}
+
+# Upper bound on points returned when the resolution is picked automatically.
+MAX_POINTS = 1500
+
+_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_window(window: str) -> int:
+    """'90m' / '24h' / '7d' / '4w' -> seconds."""
+    w = (window or "").strip().lower()
+    if len(w) < 2 or w[-1] not in _UNITS or not w[:-1].isdigit():
+        raise ValueError(f"invalid window {window!r}; expected e.g. 60m, 24h, 7d, 4w")
+    return int(w[:-1]) * _UNITS[w[-1]]
+
+
+def pick_resolution(window_s: int) -> str:
+    for name, (step, retention) in RESOLUTIONS.items():
+        if window_s <= retention and window_s / step <= MAX_POINTS:
+            return name
+    return "day"
+
+
+def event_confidence(conditions: Iterable[Dict[str, Any]]) -> Optional[float]:
+    """Mean of the condition confidences of one event (None if none reported)."""
+    confs = [c.get("confidence") for c in conditions]
+    confs = [float(c) for c in confs if c is not None]
+    return sum(confs) / len(confs) if confs else None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    checkpoint_id TEXT NOT NULL,
+    resolution    TEXT NOT NULL,
+    t             INTEGER NOT NULL,
+    pass          INTEGER NOT NULL DEFAULT 0,
+    fail          INTEGER NOT NULL DEFAULT 0,
+    conf_sum      REAL NOT NULL DEFAULT 0,
+    conf_n        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (checkpoint_id, resolution, t)
+);
+CREATE INDEX IF NOT EXISTS buckets_res_t ON buckets (resolution, t);
+"""
+
+
+class RollupStore:
+    """
+    Per-checkpoint PASS/FAIL counts and confidence sums in time buckets,
+    kept in a sqlite table (one row per checkpoint/resolution/bucket).
+
+    add() upserts the event's buckets and commits, so writers in different
+    processes (ROS node, demo UI) merge instead of overwriting each other and
+    readers always see current data. prune() drops expired buckets and is
+    rate-limited to prune_interval_s unless forced.
+    """
+
+    def __init__(self, path: Path, prune_interval_s: float = 60.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.prune_interval_s = float(prune_interval_s)
+        self._last_prune = 0.0
+        # one connection shared by request threads; every use holds the lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def add(self, checkpoint_id: str, timestamp_utc: str, result: str,
+            confidence: Optional[float] = None) -> None:
+        t = parse_ts(timestamp_utc)
+        passed, failed = (1, 0) if result == "PASS" else (0, 1)
+        conf_sum, conf_n = (float(confidence), 1) if confidence is not None else (0.0, 0)
+        rows = [
+            (checkpoint_id, name, int(t // step * step), passed, failed, conf_sum, conf_n)
+            for name, (step, _) in RESOLUTIONS.items()
+        ]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO buckets (checkpoint_id, resolution, t, pass, fail, conf_sum, conf_n) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(checkpoint_id, resolution, t) DO UPDATE SET "
+                "pass = pass + excluded.pass, fail = fail + excluded.fail, "
+                "conf_sum = conf_sum + excluded.conf_sum, conf_n = conf_n + excluded.conf_n",
+                rows,
+            )
+
+    def prune(self, force: bool = False, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        with self._lock, self._db:
+            if not force and now - self._last_prune < self.prune_interval_s:
+                return
+            for name, (_, retention) in RESOLUTIONS.items():
+                self._db.execute(
+                    "DELETE FROM buckets WHERE resolution = ? AND t < ?", (name, now - retention)
+                )
+            self._last_prune = now
+
+    def checkpoints(self) -> List[str]:
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT checkpoint_id FROM buckets ORDER BY checkpoint_id").fetchall()
+        return [r[0] for r in rows]
+
+    def trend(self, checkpoint_id: str, window_s: int,
+              resolution: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        resolution = resolution or pick_resolution(window_s)
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"invalid resolution {resolution!r}; expected one of {list(RESOLUTIONS)}")
+        step, _ = RESOLUTIONS[resolution]
+        now = time.time() if now is None else now
+
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT t, pass, fail, conf_sum, conf_n FROM buckets "
+                "WHERE checkpoint_id = ? AND resolution = ? AND t > ? ORDER BY t",
+                (checkpoint_id, resolution, now - window_s - step),
+            ).fetchall()
+
+        points = []
+        for t, passed, failed, conf_sum, conf_n in rows:
+            total = passed + failed
+            points.append({
+                "t": datetime.fromtimestamp(t, timezone.utc).isoformat(),
+                "pass": passed,
+                "fail": failed,
+                "pass_rate": round(passed / total, 4) if total else None,
+                "mean_confidence": round(conf_sum / conf_n, 4) if conf_n else None,
+            })
+
+        return {
+            "checkpoint_id": checkpoint_id,
+            "resolution": resolution,
+            "bucket_seconds": step,
+            "points": points,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -19,6 +19,13 @@ def read_json(path: Path) -> Optional[Dict[str, Any]]:
         return None
     return json.loads(path.read_text(encoding="utf-8"))
 
+def latest_version(latest: Dict[str, Any]) -> int:
+    """Highest per-checkpoint `version` in a latest.json payload (0 if none)."""
+    return max(
+        (int(v.get("version", 0)) for v in latest.values() if isinstance(v, dict)),
+        default=0,
+    )
+
 def append_jsonl(path: Path, obj: Dict[str, Any]) -> None:
     with path.open("a", encoding="utf-8") as f:
         f.write(json.dumps(obj) + "\n")
@@ -6,6 +6,10 @@ from typing import Any, Dict, List, Optional
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
+def parse_ts(ts: str) -> float:
+    """ISO-8601 timestamp (as written by utc_now_iso, or with a trailing Z) -> epoch seconds."""
+    return datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp()
+
 def make_run_id(prefix: str = "IR") -> str:
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H%M%SZ")
     return f"{prefix}-{ts}"
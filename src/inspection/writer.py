@@ -2,7 +2,8 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from typing import Any, Dict
-import cv2
+
+from src.inspection.run_io import latest_version
 
 def ensure_run_dir() -> Path:
     base = Path("outputs/runs")
@@ -23,9 +24,6 @@ def append_event(path: Path, event: Dict[str, Any]) -> None:
 
 def update_latest(path: Path, checkpoint_id: str, data: Dict[str, Any]) -> None:
     latest = json.loads(path.read_text() or "{}")
-    latest[checkpoint_id] = data
+    # monotonically increasing version so readers can ask for deltas
+    latest[checkpoint_id] = {**data, "version": latest_version(latest) + 1}
     path.write_text(json.dumps(latest, indent=2))
-
-def save_image(path: Path, bgr_img) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    cv2.imwrite(str(path), bgr_img)
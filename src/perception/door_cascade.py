@@ -0,0 +1,76 @@
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from ultralytics import YOLO
+
+from src.perception.yolo_infer import Detection, YoloInfer, roi_pixels
+from src.inspection.evaluator import DOOR
+
+@dataclass
+class CascadeStats:
+    classifier: int = 0   # frames answered by the classifier alone
+    detector: int = 0     # frames that fell back to the full detector
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        total = self.classifier + self.detector
+        return round(self.classifier / total, 4) if total else None
+
+    def to_dict(self) -> Dict:
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+class DoorClassifier:
+    """
+    Small image-classification model (ultralytics *-cls weights) whose classes
+    are the door states: door_open/door_closed/door_semi (or open/closed/semi).
+    """
+
+    def __init__(self, weights_path: str, device: str, imgsz: int = 224):
+        self.model = YOLO(weights_path)
+        self.device = device
+        self.imgsz = int(imgsz)
+        self.names: Dict[int, str] = {
+            i: (n if n in DOOR else f"door_{n}") for i, n in self.model.names.items()
+        }
+
+    def classify(self, bgr_img, roi: Optional[Sequence[float]] = None) -> Tuple[Optional[str], float]:
+        x0, y0, x1, y1 = roi_pixels(bgr_img.shape, roi)
+        res = self.model.predict(
+            source=bgr_img[y0:y1, x0:x1],
+            device=self.device,
+            imgsz=self.imgsz,
+            verbose=False,
+        )[0]
+        if res.probs is None:
+            return None, 0.0
+        cls = self.names[int(res.probs.top1)]
+        return (cls if cls in DOOR else None), float(res.probs.top1conf)
+
+class DoorCascade:
+    """
+    Door-state checkpoints try the classifier first and only pay for the
+    detector when its confidence is below min_confidence.
+    """
+
+    def __init__(self, classifier: DoorClassifier, detector: YoloInfer, min_confidence: float):
+        self.classifier = classifier
+        self.detector = detector
+        self.min_confidence = float(min_confidence)
+        self.stats: Dict[str, CascadeStats] = {}
+
+    def infer(self, cid: str, bgr_img, roi: Optional[Sequence[float]] = None,
+              imgsz: Optional[int] = None) -> Tuple[List[Detection], str]:
+        """Returns (detections, stage) where stage is "classifier" or "detector"."""
+        stats = self.stats.setdefault(cid, CascadeStats())
+        cls, conf = self.classifier.classify(bgr_img, roi)
+        if cls is not None and conf >= self.min_confidence:
+            stats.classifier += 1
+            # whole ROI as the "box" so annotation and best_door work unchanged
+            x0, y0, x1, y1 = roi_pixels(bgr_img.shape, roi)
+            return [Detection(cls, conf, [float(x0), float(y0), float(x1), float(y1)])], "classifier"
+
+        stats.detector += 1
+        return self.detector.infer(bgr_img, roi=roi, imgsz=imgsz), "detector"
+
+    def summary(self) -> Dict[str, Dict]:
+        return {cid: s.to_dict() for cid, s in self.stats.items()}
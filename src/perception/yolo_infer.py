@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence, Tuple
+import cv2
 from ultralytics import YOLO
 
 @dataclass
@@ -9,6 +10,28 @@ class Detection:
     conf: float
     xyxy: List[float]
 
+def roi_pixels(shape, roi: Optional[Sequence[float]]) -> Tuple[int, int, int, int]:
+    """[x1, y1, x2, y2] as fractions of the frame -> clamped pixel box."""
+    h, w = shape[:2]
+    if not roi:
+        return 0, 0, w, h
+    x1, y1, x2, y2 = roi
+    px1, py1 = max(0, int(x1 * w)), max(0, int(y1 * h))
+    px2, py2 = min(w, int(round(x2 * w))), min(h, int(round(y2 * h)))
+    if px2 <= px1 or py2 <= py1:
+        return 0, 0, w, h
+    return px1, py1, px2, py2
+
+def validate_roi(roi) -> Optional[List[float]]:
+    if roi is None:
+        return None
+    if not isinstance(roi, (list, tuple)) or len(roi) != 4:
+        raise ValueError(f"roi must be [x1, y1, x2, y2] fractions, got {roi!r}")
+    x1, y1, x2, y2 = (float(v) for v in roi)
+    if not (0.0 <= x1 < x2 <= 1.0 and 0.0 <= y1 < y2 <= 1.0):
+        raise ValueError(f"roi must satisfy 0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1, got {roi!r}")
+    return [x1, y1, x2, y2]
+
 class YoloInfer:
     def __init__(self, weights_path: str, device: str, conf_threshold: float, imgsz: int):
         self.model = YOLO(weights_path)
@@ -17,12 +40,19 @@ class YoloInfer:
         self.imgsz = int(imgsz)
         self.names: Dict[int, str] = self.model.names
 
-    def infer(self, bgr_img) -> List[Detection]:
+    def infer(self, bgr_img, roi: Optional[Sequence[float]] = None,
+              imgsz: Optional[int] = None) -> List[Detection]:
+        """
+        Detect on the whole frame, or only inside `roi` (fractions of the frame)
+        letterboxed to `imgsz`. Boxes are always in full-frame pixel coordinates.
+        """
+        x0, y0, x1, y1 = roi_pixels(bgr_img.shape, roi)
+        src = bgr_img[y0:y1, x0:x1] if roi else bgr_img
         res = self.model.predict(
-            source=bgr_img,
+            source=src,
             device=self.device,
             conf=self.conf,
-            imgsz=self.imgsz,
+            imgsz=int(imgsz or self.imgsz),
             verbose=False,
         )[0]
         dets: List[Detection] = []
@@ -31,16 +61,43 @@ class YoloInfer:
         for i in range(len(res.boxes)):
             cls_id = int(res.boxes.cls[i].item())
             conf = float(res.boxes.conf[i].item())
-            xyxy = res.boxes.xyxy[i].tolist()
-            dets.append(Detection(self.names[cls_id], conf, xyxy))
+            bx1, by1, bx2, by2 = res.boxes.xyxy[i].tolist()
+            dets.append(Detection(self.names[cls_id], conf, [bx1 + x0, by1 + y0, bx2 + x0, by2 + y0]))
         return dets
 
-    def annotate(self, bgr_img):
-        res = self.model.predict(
-            source=bgr_img,
-            device=self.device,
-            conf=self.conf,
-            imgsz=self.imgsz,
-            verbose=False,
-        )[0]
-        return res.plot()
+    def annotate(self, bgr_img, dets: Optional[List[Detection]] = None,
+                 roi: Optional[Sequence[float]] = None):
+        """
+        Draw detections on a copy of the full frame. Without `dets` this runs
+        its own full-frame prediction (legacy behaviour).
+        """
+        if dets is None:
+            res = self.model.predict(
+                source=bgr_img,
+                device=self.device,
+                conf=self.conf,
+                imgsz=self.imgsz,
+                verbose=False,
+            )[0]
+            return res.plot()
+
+        out = bgr_img.copy()
+        if roi:
+            x0, y0, x1, y1 = roi_pixels(bgr_img.shape, roi)
+            cv2.rectangle(out, (x0, y0), (x1 - 1, y1 - 1), (255, 200, 0), 1)
+        for d in dets:
+            x1, y1, x2, y2 = (int(v) for v in d.xyxy)
+            color = _class_color(d.cls_name)
+            cv2.rectangle(out, (x1, y1), (x2, y2), color, 2)
+            label = f"{d.cls_name} {d.conf:.2f}"
+            (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            ty = max(y1, th + 4)
+            cv2.rectangle(out, (x1, ty - th - 4), (x1 + tw + 4, ty), color, -1)
+            cv2.putText(out, label, (x1 + 2, ty - 3), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+        return out
+
+_PALETTE = [(56, 56, 255), (151, 157, 255), (31, 112, 255), (29, 178, 255), (49, 210, 207),
+            (10, 249, 72), (23, 204, 146), (134, 219, 61), (52, 147, 26), (187, 212, 0)]
+
+def _class_color(name: str) -> Tuple[int, int, int]:
+    return _PALETTE[sum(name.encode()) % len(_PALETTE)]
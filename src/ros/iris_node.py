@@ -12,7 +12,8 @@ from sensor_msgs.msg import Image
 from cv_bridge import CvBridge
 import yaml
 
-from src.perception.yolo_infer import YoloInfer
+from src.perception.yolo_infer import YoloInfer, validate_roi
+from src.perception.door_cascade import DoorCascade, DoorClassifier
 from src.inspection.evaluator import evaluate
 
 # Run + I/O helpers (you already have these modules)
@@ -23,7 +24,9 @@ from src.inspection.run_io import (
     build_report_from_events,
     write_csv,
 )
-from src.inspection.writer import append_event, update_latest, save_image
+from src.inspection.writer import append_event, update_latest
+from src.inspection.image_store import ImageStore
+from src.inspection.rollups import RollupStore, event_confidence
 
 
 class IRISInspector(Node):
@@ -51,6 +54,10 @@ class IRISInspector(Node):
             cfg = self.checkpoints.get(cid, {})
             self.cp_name[cid] = cfg.get("name") or cfg.get("display_name") or cid
 
+        # Optional per-checkpoint crop region + inference size
+        self.roi = {cid: validate_roi(self.checkpoints.get(cid, {}).get("roi")) for cid in checkpoint_ids}
+        self.roi_imgsz = {cid: self.checkpoints.get(cid, {}).get("imgsz") for cid in checkpoint_ids}
+
         # ---- Throttling ----
         self.throttle_hz = float(cfg_model.get("throttle_hz", 2))
         self.min_dt = 1.0 / self.throttle_hz
@@ -64,12 +71,43 @@ class IRISInspector(Node):
             imgsz=cfg_model["imgsz"],
         )
 
+        # Optional two-stage cascade for checkpoints that only check door_state
+        cas_cfg = cfg_model.get("cascade", {}) or {}
+        self.cascade = None
+        self.cascade_ids = set()
+        if cas_cfg.get("enabled"):
+            self.cascade = DoorCascade(
+                DoorClassifier(
+                    weights_path=cas_cfg["classifier_weights"],
+                    device=cfg_model["device"],
+                    imgsz=cas_cfg.get("imgsz", 224),
+                ),
+                self.yolo,
+                min_confidence=cas_cfg.get("min_confidence", 0.85),
+            )
+            self.cascade_ids = {
+                cid for cid in checkpoint_ids
+                if set(self.checkpoints.get(cid, {}).get("expected", {})) == {"door_state"}
+            }
+            self.get_logger().info(f"Door cascade enabled for: {sorted(self.cascade_ids)}")
+
         # ---- Output paths (stable "outputs/current") ----
         self.out_dir = current_dir()
         self.events_path = self.out_dir / "events.jsonl"
         self.latest_path = self.out_dir / "latest.json"
-        self.images_dir = self.out_dir / "images"
-        self.images_dir.mkdir(parents=True, exist_ok=True)
+
+        # Trend rollups live next to "current" so they survive across runs
+        self.rollups = RollupStore(self.out_dir.parent / "rollups.sqlite")
+
+        # Per-event evidence images, content-addressed and deduplicated
+        ev_cfg = cfg_model.get("evidence", {}) or {}
+        max_mb = ev_cfg.get("max_mb")
+        max_days = ev_cfg.get("max_age_days")
+        self.evidence = ImageStore(
+            self.out_dir.parent / "evidence",
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+            max_age_s=float(max_days) * 86400 if max_days else None,
+        )
 
         # ---- Subscriptions ----
         for cid, topic in self.topics.items():
@@ -89,8 +127,12 @@ class IRISInspector(Node):
         self.robot_state = "EVALUATING"
 
         bgr = self.bridge.imgmsg_to_cv2(msg, desired_encoding="bgr8")
-        dets = self.yolo.infer(bgr)
-        annotated = self.yolo.annotate(bgr)
+        roi = self.roi.get(cid)
+        if cid in self.cascade_ids:
+            dets, stage = self.cascade.infer(cid, bgr, roi=roi, imgsz=self.roi_imgsz.get(cid))
+        else:
+            dets, stage = self.yolo.infer(bgr, roi=roi, imgsz=self.roi_imgsz.get(cid)), "detector"
+        annotated = self.yolo.annotate(bgr, dets, roi=roi)
 
         expected = self.checkpoints[cid]["expected"]
         conds = evaluate(expected, dets)
@@ -100,8 +142,9 @@ class IRISInspector(Node):
         passed_all = all(c.passed for c in gating) if gating else False
         result = "PASS" if passed_all else "FAIL"
 
-        img_path = self.images_dir / f"{cid}.jpg"
-        save_image(img_path, annotated)
+        timestamp = utc_now_iso()
+        sha = self.evidence.put(annotated, cid, timestamp, result=result, run_id=self.run_id)
+        img_ref = self.evidence.ref_for(sha)
 
         reason = ""
         for c in gating:
@@ -110,7 +153,7 @@ class IRISInspector(Node):
                 break
 
         event = {
-            "timestamp_utc": utc_now_iso(),
+            "timestamp_utc": timestamp,
             "run_id": self.run_id,
             "run_start_utc": self.run_start_utc,
             "run_state": self.run_state,
@@ -123,6 +166,7 @@ class IRISInspector(Node):
             "camera_topic": self.topics.get(cid, ""),
 
             "result": result,
+            "inference_stage": stage,
             "conditions": [
                 {
                     # backward-compatible + explicit
@@ -136,11 +180,13 @@ class IRISInspector(Node):
                 }
                 for c in conds
             ],
-            "image_ref": str(img_path),
+            "image_ref": str(self.evidence.path_for(sha)),
+            "image_sha256": sha,
         }
 
         # Append to events.jsonl
         append_event(self.events_path, event)
+        self.rollups.add(cid, event["timestamp_utc"], result, event_confidence(event["conditions"]))
 
         # Update latest.json
         update_latest(
@@ -155,7 +201,8 @@ class IRISInspector(Node):
 
                 "result": result,
                 "reason": reason,
-                "image": f"images/{cid}.jpg",
+                "image": f"evidence/{img_ref}",
+                "inference_stage": stage,
                 "conditions": event["conditions"],
             },
         )
@@ -196,8 +243,11 @@ class IRISInspector(Node):
                     "status": "PASS" if failed == 0 else "FAIL",
                 },
             }
+            if self.cascade is not None:
+                run_json["cascade"] = self.cascade.summary()
 
             write_json(self.out_dir / "run.json", run_json)
+            self.rollups.prune()
 
             report_rows = build_report_from_events(self.events_path)
             write_json(self.out_dir / "report.json", report_rows)
@@ -219,7 +269,11 @@ def main():
 
     rclpy.init()
     node = IRISInspector(cfg_topics, cfg_checkpoints, cfg_model)
-    rclpy.spin(node)
+    try:
+        rclpy.spin(node)
+    finally:
+        node.rollups.close()
+        node.evidence.close()
     node.destroy_node()
     rclpy.shutdown()
 
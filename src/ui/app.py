@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import gzip
 import json
 import random
+import threading
 import yaml
 
 from pathlib import Path
-from flask import Flask, jsonify, render_template, send_from_directory, send_file
+from flask import Flask, abort, jsonify, render_template, request, send_from_directory, send_file
 from src.inspection.schema import make_run_id, utc_now_iso
+from src.inspection.run_io import latest_version
+from src.inspection.rollups import RollupStore, event_confidence, parse_window
+from src.inspection.image_store import ImageStore
 
 app = Flask(__name__)
 
@@ -16,6 +21,8 @@ OUT = ROOT / "outputs" / "current"
 LATEST = OUT / "latest.json"
 IMAGES = OUT / "images"
 EVENTS = OUT / "events.jsonl"
+ROLLUPS = ROOT / "outputs" / "rollups.sqlite"
+EVIDENCE = ROOT / "outputs" / "evidence"
 
 CFG_CHECKPOINTS = ROOT / "configs" / "checkpoints.yaml"
 
@@ -29,6 +36,94 @@ def _read_json(path: Path, default):
     return json.loads(txt)
 
 
+_json_cache = {}
+_rollups = None
+_evidence = None
+# request threads share one store each; guard the lazy construction
+_stores_lock = threading.Lock()
+
+
+def _get_evidence() -> ImageStore:
+    global _evidence
+    with _stores_lock:
+        if _evidence is None:
+            _evidence = ImageStore(EVIDENCE)
+    return _evidence
+
+
+def _get_rollups() -> RollupStore:
+    global _rollups
+    with _stores_lock:
+        if _rollups is None:
+            _rollups = RollupStore(ROLLUPS)
+    return _rollups
+
+
+def _read_json_cached(path: Path, default):
+    """Like _read_json, but re-parses only when the file changes on disk."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return default
+    key = (st.st_mtime_ns, st.st_size)
+    hit = _json_cache.get(path)
+    if hit is None or hit[0] != key:
+        hit = (key, _read_json(path, default))
+        _json_cache[path] = hit
+    return hit[1]
+
+
+# Version at which the set of checkpoint IDs in latest.json last changed, as
+# seen by this process. Delta clients only need the full ID list past it.
+_membership = {"data": None, "keys": None, "version": 0}
+_membership_lock = threading.Lock()
+
+
+def _read_latest():
+    return _read_json_cached(LATEST, {})
+
+
+def _membership_version(latest: dict) -> int:
+    with _membership_lock:
+        if _membership["data"] is not latest:
+            # only re-check keys when latest.json was re-parsed
+            keys = frozenset(latest.keys())
+            if keys != _membership["keys"]:
+                # first load counts as a change: we cannot know what came before
+                _membership["keys"] = keys
+                _membership["version"] = latest_version(latest)
+            _membership["data"] = latest
+        return _membership["version"]
+
+
+def _int_arg(name: str):
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        abort(400, description=f"'{name}' must be an integer")
+
+
+def _filter_latest(latest: dict, since, statuses, seq_min, seq_max) -> dict:
+    out = {}
+    for cid, d in latest.items():
+        if not isinstance(d, dict):
+            continue
+        if since is not None and int(d.get("version", 0)) <= since:
+            continue
+        if statuses and str(d.get("result", "")).upper() not in statuses:
+            continue
+        seq = d.get("checkpoint_sequence")
+        if seq_min is not None and (seq is None or seq < seq_min):
+            continue
+        if seq_max is not None and (seq is None or seq > seq_max):
+            continue
+        out[cid] = d
+    return out
+
+
 def _write_json(path: Path, obj):
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(obj, indent=2), encoding="utf-8")
@@ -126,6 +221,28 @@ def _recompute_summary(latest: dict, run: dict):
     return run
 
 
+# Only compress JSON bodies big enough for gzip to pay off
+GZIP_MIN_BYTES = 512
+
+
+@app.after_request
+def gzip_json(response):
+    if (
+        response.mimetype != "application/json"
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or not request.accept_encodings["gzip"]  # honours q-values, e.g. gzip;q=0
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=5))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 @app.get("/")
 def home():
     return render_template("dashboard.html")
@@ -133,17 +250,105 @@ def home():
 
 @app.get("/api/latest")
 def api_latest():
-    if not LATEST.exists():
-        return jsonify({})
-    return jsonify(json.loads(LATEST.read_text() or "{}"))
+    """
+    Latest state per checkpoint.
+
+    Query options:
+      - since=<version>     only checkpoints changed after that version
+      - status=FAIL[,PASS]  only checkpoints with one of these results
+      - seq_min / seq_max   inclusive checkpoint_sequence range
+      - view=list           compact envelope without condition details:
+                            {"version", "full", "ids"?, "checkpoints", "removed"}
+
+    In the list view, "removed" holds checkpoints that changed after `since`
+    but no longer match the status/sequence filters, so filtered delta
+    clients can drop them; "full" is true when the response is a complete
+    snapshot (no `since`, or a resync). "ids" (every checkpoint ID) is only
+    sent on full snapshots or when the set of checkpoints changed after
+    `since`; otherwise clients keep the IDs they already have.
+
+    Without view=list the legacy {checkpoint_id: entry} payload is returned;
+    it cannot report removals, so it rejects `since` combined with filters.
+    """
+    latest = _read_latest()
+    version = latest_version(latest)
+
+    since = _int_arg("since")
+    if since is not None and since > version:
+        # latest.json was recreated; the client must resync from scratch
+        since = None
+    statuses = {s.strip().upper() for s in request.args.get("status", "").split(",") if s.strip()}
+    seq_min = _int_arg("seq_min")
+    seq_max = _int_arg("seq_max")
+
+    filtered = bool(statuses) or seq_min is not None or seq_max is not None
+    list_view = request.args.get("view") == "list"
+    if not list_view and filtered and request.args.get("since"):
+        abort(400, description="'since' with status/seq filters requires view=list")
+
+    selected = _filter_latest(latest, since, statuses, seq_min, seq_max)
+
+    if not list_view:
+        return jsonify(selected)
+
+    removed = []
+    if since is not None and filtered:
+        changed = _filter_latest(latest, since, None, None, None)
+        removed = [cid for cid in changed if cid not in selected]
+
+    body = {
+        "version": version,
+        "full": since is None,
+        "checkpoints": {
+            cid: {k: v for k, v in d.items() if k != "conditions"}
+            for cid, d in selected.items()
+        },
+        "removed": removed,
+    }
+    membership_version = _membership_version(latest)
+    if since is None or since < membership_version:
+        body["ids"] = list(latest.keys())
+    return jsonify(body)
+
+
+@app.get("/api/latest/<cid>")
+def api_latest_checkpoint(cid: str):
+    d = _read_latest().get(cid)
+    if d is None:
+        abort(404)
+    return jsonify(d)
 
 
 @app.get("/api/run")
 def api_run():
-    p = OUT / "run.json"
-    if not p.exists():
-        return jsonify({})
-    return jsonify(json.loads(p.read_text(encoding="utf-8")))
+    return jsonify(_read_json_cached(OUT / "run.json", {}))
+
+
+@app.get("/api/trends")
+def api_trends():
+    """
+    Pre-aggregated PASS/FAIL counts and mean confidence over time.
+
+    Query options:
+      - checkpoint=<id>     single checkpoint (default: all known checkpoints)
+      - window=24h          look-back window (m/h/d/w units)
+      - resolution=hour     minute/hour/day (default: picked from window)
+    """
+    try:
+        window_s = parse_window(request.args.get("window", "24h"))
+    except ValueError as e:
+        abort(400, description=str(e))
+    resolution = request.args.get("resolution") or None
+
+    store = _get_rollups()
+    cid = request.args.get("checkpoint")
+    ids = [cid] if cid else store.checkpoints()
+    try:
+        trends = {c: store.trend(c, window_s, resolution) for c in ids}
+    except ValueError as e:
+        abort(400, description=str(e))
+
+    return jsonify(trends[cid] if cid else trends)
 
 
 @app.get("/download/json")
@@ -163,6 +368,36 @@ def images(name: str):
     return send_from_directory(IMAGES, name)
 
 
+@app.get("/evidence/<path:name>")
+def evidence(name: str):
+    # content-addressed: a given URL never changes, so clients may cache it for good
+    return send_from_directory(EVIDENCE / "objects", name, max_age=31536000)
+
+
+@app.get("/api/evidence")
+def api_evidence():
+    """
+    Evidence image history, newest first.
+
+    Query options: run_id, checkpoint, result (PASS/FAIL), limit (default 100).
+    """
+    limit = _int_arg("limit")
+    if limit is None:
+        limit = 100
+    elif limit < 1:
+        abort(400, description="'limit' must be at least 1")
+    result = request.args.get("result")
+    refs = _get_evidence().lookup(
+        run_id=request.args.get("run_id") or None,
+        checkpoint_id=request.args.get("checkpoint") or None,
+        result=result.upper() if result else None,
+        limit=min(limit, 1000),
+    )
+    for r in refs:
+        r["image"] = f"evidence/{r['image']}"
+    return jsonify(refs)
+
+
 # -------------------------------
 # Demo Control Mode (#6)
 # -------------------------------
@@ -180,9 +415,13 @@ def demo_start():
     names = _checkpoint_names()
     now = run["start_time_utc"]
 
+    # keep versions increasing across resets so delta clients pick up the new seed
+    version = latest_version(_read_json(LATEST, {})) + 1
+
     seed = {}
     for i, cid in enumerate(ids, start=1):
         seed[cid] = {
+            "version": version,
             "updated_utc": now,
             "run_id": run["run_id"],
             "run_start_utc": run["start_time_utc"],
@@ -212,9 +451,13 @@ def demo_reset():
     names = _checkpoint_names()
     now = run["start_time_utc"]
 
+    # keep versions increasing across resets so delta clients pick up the new seed
+    version = latest_version(_read_json(LATEST, {})) + 1
+
     seed = {}
     for i, cid in enumerate(ids, start=1):
         seed[cid] = {
+            "version": version,
             "updated_utc": now,
             "run_id": run["run_id"],
             "run_start_utc": run["start_time_utc"],
@@ -275,6 +518,7 @@ def _simulate(result: str):
         })
     
     latest[target] = {
+        "version": latest_version(latest) + 1,
         "updated_utc": now,
         "run_id": run.get("run_id"),
         "run_start_utc": run.get("start_time_utc"),
@@ -300,6 +544,10 @@ def _simulate(result: str):
     }
     _append_jsonl(EVENTS, event)
 
+    rollups = _get_rollups()
+    rollups.add(target, now, result, event_confidence(demo_conditions))
+    rollups.prune()
+
     run = _recompute_summary(latest, run)
 
     _write_json(LATEST, latest)
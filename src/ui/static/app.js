@@ -1,5 +1,15 @@
+// Highest checkpoint version seen so far; null forces a full resync.
+let latestVersion = null;
+
 async function pullLatest() {
-  const r = await fetch("/api/latest");
+  const q = latestVersion === null ? "" : `&since=${latestVersion}`;
+  const r = await fetch(`/api/latest?view=list${q}`);
+  return await r.json();
+}
+
+async function pullCheckpoint(cid) {
+  const r = await fetch(`/api/latest/${encodeURIComponent(cid)}`);
+  if (!r.ok) return {};
   return await r.json();
 }
 
@@ -27,24 +37,127 @@ function fmtUtc(s) {
   return s || "—";
 }
 
-function card(id, d) {
+// Per-checkpoint card elements, keyed by checkpoint ID.
+// Each entry: { el, sig, imgSrc, title, img, status, updated, reason }
+const cards = new Map();
+
+// Merged checkpoint state (without condition details), keyed by checkpoint ID.
+let latestState = {};
+
+function mergeLatest(delta) {
+  // the full ID list only comes with snapshots or membership changes;
+  // otherwise keep the current set (plus any newly reported checkpoints)
+  const ids = delta?.ids
+    ? new Set(delta.ids)
+    : new Set([...Object.keys(latestState), ...Object.keys(delta?.checkpoints || {})]);
+  for (const cid of delta?.removed || []) ids.delete(cid);
+  const next = {};
+  for (const cid of ids) {
+    const d = delta?.checkpoints?.[cid] || latestState[cid];
+    if (d) next[cid] = d;
+  }
+  latestState = next;
+  latestVersion = delta?.version ?? null;
+  return latestState;
+}
+
+function cardSignature(d) {
+  return [
+    d?.updated_utc || "",
+    d?.result || "",
+    d?.reason || "",
+    d?.checkpoint_name || "",
+    d?.checkpoint_sequence || "",
+    d?.image || "",
+  ].join("|");
+}
+
+function createCard(id) {
+  const el = document.createElement("div");
+  el.className = "card";
+  el.setAttribute("data-cid", id);
+
+  const title = document.createElement("div");
+  title.className = "title";
+
+  const img = document.createElement("img");
+  img.onerror = () => { img.style.display = "none"; };
+  img.onload = () => { img.style.display = ""; };
+
+  const status = document.createElement("div");
+  status.className = "meta";
+  status.append("Status: ", document.createElement("b"));
+
+  const updated = document.createElement("div");
+  updated.className = "meta";
+
+  const reason = document.createElement("div");
+  reason.className = "meta";
+
+  const hint = document.createElement("div");
+  hint.className = "meta hint";
+  hint.textContent = "Click for condition details";
+
+  el.append(title, img, status, updated, reason, hint);
+
+  return { el, sig: null, imgSrc: null, title, img, status, updated, reason };
+}
+
+function patchCard(entry, id, d) {
+  const sig = cardSignature(d);
+  if (sig === entry.sig) return;
+  entry.sig = sig;
+
   const status = (d?.result || "UNKNOWN").toLowerCase();
-  const ts = Date.now();
+  entry.el.className = `card ${status}`;
 
   const name = d?.checkpoint_name || id;
   const seq = d?.checkpoint_sequence ? `#${d.checkpoint_sequence}` : "";
-  const updated = d?.updated_utc || "";
+  entry.title.textContent = `${seq} ${name}`;
+
+  entry.status.querySelector("b").textContent = fmtStatus(d?.result);
+  entry.updated.textContent = `Updated: ${d?.updated_utc || ""}`;
+
+  entry.reason.textContent = d?.reason ? `Reason: ${d.reason}` : "";
+  entry.reason.style.display = d?.reason ? "" : "none";
+
+  // reload the image only when it changes: evidence images are
+  // content-addressed, legacy per-checkpoint images are versioned by update time
+  const src = d?.image?.startsWith("evidence/")
+    ? `/${d.image}`
+    : `/images/${id}.jpg?v=${encodeURIComponent(d?.updated_utc || "")}`;
+  if (src !== entry.imgSrc) {
+    entry.imgSrc = src;
+    entry.img.style.display = "";
+    entry.img.src = src;
+  }
+}
 
-  return `
-    <div class="card ${status}" data-cid="${id}">
-      <div class="title">${seq} ${name}</div>
-      <img src="/images/${id}.jpg?t=${ts}" onerror="this.style.display='none';" />
-      <div class="meta">Status: <b>${fmtStatus(d?.result)}</b></div>
-      <div class="meta">Updated: ${updated}</div>
-      ${d?.reason ? `<div class="meta">Reason: ${d.reason}</div>` : ``}
-      <div class="meta hint">Click for condition details</div>
-    </div>
-  `;
+function renderCards(grid, ids, latest) {
+  // drop cards for checkpoints that disappeared (e.g. after a reset)
+  for (const [cid, entry] of cards) {
+    if (!(cid in latest)) {
+      entry.el.remove();
+      cards.delete(cid);
+    }
+  }
+
+  for (const id of ids) {
+    let entry = cards.get(id);
+    if (!entry) {
+      entry = createCard(id);
+      cards.set(id, entry);
+    }
+    patchCard(entry, id, latest[id]);
+  }
+
+  // only touch DOM order when it actually differs
+  const current = Array.from(grid.children);
+  const inOrder = current.length === ids.length &&
+    ids.every((id, i) => current[i] === cards.get(id).el);
+  if (!inOrder) {
+    for (const id of ids) grid.appendChild(cards.get(id).el);
+  }
 }
 
 function openModal(title, subtitle, bodyHtml) {
@@ -112,17 +225,17 @@ function conditionsTable(conditions) {
   `;
 }
 
-function attachCardClicks(latest) {
+function attachCardClicks() {
   const grid = document.getElementById("grid");
   if (!grid) return;
 
-  // event delegation
-  grid.onclick = (e) => {
+  // event delegation (attached once); condition details are fetched on open
+  grid.onclick = async (e) => {
     const cardEl = e.target.closest(".card");
     if (!cardEl) return;
 
     const cid = cardEl.getAttribute("data-cid");
-    const d = latest[cid] || {};
+    const d = await pullCheckpoint(cid);
 
     const title = d.checkpoint_name || cid;
     const seq = d.checkpoint_sequence ? `Checkpoint #${d.checkpoint_sequence}` : "Checkpoint";
@@ -139,7 +252,8 @@ function attachCardClicks(latest) {
 
 async function render() {
   // fetch both (run + latest) in parallel
-  const [run, latest] = await Promise.all([pullRun(), pullLatest()]);
+  const [run, delta] = await Promise.all([pullRun(), pullLatest()]);
+  const latest = mergeLatest(delta);
 
   // ---- Fill run header ----
   setText("run_id", run?.run_id);
@@ -160,14 +274,12 @@ async function render() {
     return a.localeCompare(b);
   });
 
-  document.getElementById("grid").innerHTML = ids.map(id => card(id, latest[id])).join("");
+  const grid = document.getElementById("grid");
+  if (grid) renderCards(grid, ids, latest);
 
   const anyFail = ids.some(id => latest[id]?.result === "FAIL");
   const alertEl = document.getElementById("alert");
   if (alertEl) alertEl.classList.toggle("hidden", !anyFail);
-
-  // Attach click handler (condition details modal)
-  attachCardClicks(latest);
 }
 
 // modal close wiring
@@ -184,6 +296,9 @@ document.addEventListener("DOMContentLoaded", () => {
   if (reset) reset.onclick = async () => { await post("/api/demo/reset"); await render(); };
   if (btn) btn.onclick = closeModal;
 
+  // Attach click handler (condition details modal)
+  attachCardClicks();
+
   const modal = document.getElementById("modal");
   if (modal) {
     modal.addEventListener("click", (e) => {